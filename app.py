@@ -4,132 +4,358 @@
 
 from youtube_transcript_api import YouTubeTranscriptApi
 from gtts import gTTS
+import requests
 import google.generativeai as genai
 from dotenv import load_dotenv
+import asyncio
+import hashlib
+import io
+import logging
 import os
-from urllib.parse import urlparse, parse_qs
+import re
+import sys
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+import cache
+from prompts import SUMMARY_STYLES, NOTES_PREFIX, NOTES_SUFFIX
+
+# Logging instead of print: lazy %-formatting skips the string work when
+# the level is off, and it plays nicer with gunicorn/waitress later
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
 
 # Load the API key from .env file
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
 
 if api_key:
-    genai.configure(api_key=api_key)
-    print("Gemini AI is ready!")
+    # transport="rest" keeps one pooled HTTP client instead of setting up a
+    # fresh channel per call
+    genai.configure(api_key=api_key, transport="rest")
+    logger.info("Gemini AI is ready!")
 else:
-    print("Error: Need to add GEMINI_API_KEY to .env file")
+    logger.error("Need to add GEMINI_API_KEY to .env file")
     exit()
 
+# Build the models once at import time - constructing GenerativeModel on
+# every call redoes SDK setup and connection work on the hot path
+_FLASH_MODEL = genai.GenerativeModel('gemini-2.5-flash')
+_FLASH_LITE_MODEL = genai.GenerativeModel('gemini-2.5-flash-lite')
+
+# One precompiled pattern covers watch, youtu.be, shorts and embed URLs -
+# much cheaper than urlparse + parse_qs building dicts for a single ID
+_VID_RE = re.compile(r'(?:youtu\.be/|youtube\.com/(?:watch\?(?:.*&)?v=|shorts/|embed/))([A-Za-z0-9_-]{11})')
+
 # Function to get video ID from YouTube URL
+# Frontends retry and poll with the same URL, so repeat lookups are free
+@lru_cache(maxsize=4096)
 def get_video_id(url):
-    parsed_url = urlparse(url)
-    
-    if parsed_url.hostname in ['www.youtube.com', 'youtube.com']:
-        video_id = parse_qs(parsed_url.query).get('v', [None])[0]
-    elif parsed_url.hostname == 'youtu.be':
-        video_id = parsed_url.path[1:]
-    else:
-        video_id = None
-        
-    return video_id
+    match = _VID_RE.search(url)
+    return match.group(1) if match else None
+
+# Cleanup patterns for caption segments, compiled once
+_NOISE_RE = re.compile(r'\[(?:music|applause|laughter)\]', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+
+def _normalize(segment_text):
+    """Cleans one caption segment: noise tags out, whitespace squashed, NFKC."""
+    cleaned = _NOISE_RE.sub('', segment_text)
+    cleaned = _WS_RE.sub(' ', cleaned)
+    return unicodedata.normalize('NFKC', cleaned).strip()
+
+# Below this many segments the process-pool startup costs more than it saves
+PROCESS_POOL_MIN_SEGMENTS = 5000
+
+def clean_segments(segments):
+    """Normalizes caption segments, fanning out across cores for very long videos."""
+    if len(segments) < PROCESS_POOL_MIN_SEGMENTS:
+        return [_normalize(s) for s in segments]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(_normalize, segments, chunksize=256))
+
+# One session shared by every transcript fetch, so repeat calls reuse the
+# TCP/TLS connection instead of paying a handshake each time
+_YT_SESSION = requests.Session()
+_YT_API = YouTubeTranscriptApi(http_client=_YT_SESSION)
 
 # Function to get transcript from YouTube
-def get_transcript(video_id):
+# A week of reuse keeps repeat requests off the network (and off YouTube's
+# rate limits) while still picking up caption fixes eventually
+@cache.cached("transcript", max_age=7 * 86400)
+def get_transcript(video_id, languages=['en', 'hi', 'fr']):
     try:
-        api = YouTubeTranscriptApi()
-        transcript_data = api.fetch(video_id, languages=['en', 'hi','fr'])
-        text = " ".join([segment.text for segment in transcript_data])
-        print(f"Got transcript: {len(text)} characters")
+        transcript_data = _YT_API.fetch(video_id, languages=languages)
+        cleaned = clean_segments([segment.text for segment in transcript_data])
+        # Generator expression so join doesn't build a throwaway list first
+        text = " ".join(piece for piece in cleaned if piece)
+        logger.info("Got transcript: %d characters", len(text))
         return text
     except Exception as e:
-        print(f"Couldn't get transcript: {e}")
+        logger.warning("Couldn't get transcript: %s", e)
         return None
 
-# Functions for AI summary and notes
-def generate_summary(text):
-    """Generates a structured, concise summary using an improved prompt."""
-    
-    prompt = f"""
-    You are an expert at creating highly concise and accurate summaries. Your task is to analyze the following video transcript and generate a summary that follows these strict rules:
-
-    **Content Rules:**
-    1.  **Be Extremely Concise:** The summary must be short and to the point. Extract only the most critical information.
-    2.  **Maintain Accuracy:** Ensure the summary is a faithful representation of the transcript's main ideas.
-
-    **Formatting Rules:**
-    1.  **Use a numbered list (1., 2., 3., etc.) for the main topics.**
-    2.  **Under each numbered point, you MAY use nested bullet points (* or -) for essential, brief details.**
-    3.  **Do NOT use any Markdown headers (e.g., #, ##, ###).** The output should be a clean list.
-    4.  ** make it under 150 words
-    Here is the transcript:
-    ---
-    {text}
-    ---
+# Function to get transcripts for a bunch of videos at the same time
+async def get_transcripts(video_ids, languages=['en', 'hi', 'fr']):
+    """Fetches transcripts for several videos concurrently.
+
+    Each fetch is a blocking network call, so we run them on worker threads
+    with asyncio.to_thread and let them overlap. Total time ends up close to
+    the slowest single fetch instead of the sum of all of them.
+    """
+    async with asyncio.TaskGroup() as tg:
+        tasks = [
+            tg.create_task(asyncio.to_thread(get_transcript, video_id, languages))
+            for video_id in video_ids
+        ]
+    return [task.result() for task in tasks]
+
+def get_transcript_batch(video_ids, languages=['en', 'hi', 'fr']):
+    """Sync wrapper so normal (non-async) code can fetch a batch."""
+    return asyncio.run(get_transcripts(video_ids, languages))
+
+# Transcripts longer than this get uploaded once through the File API and
+# referenced by handle, instead of re-sending the whole text in every prompt
+FILE_API_THRESHOLD = 8000
+
+# Uploaded transcript handles keyed by text hash, so summary then notes
+# for the same video only upload once (bounded so it can't grow forever).
+# File API uploads expire after 48 hours, so the handles expire first -
+# otherwise a long-running server would keep handing Gemini dead refs.
+_file_refs = cache.LRUCache(maxsize=256, ttl=40 * 3600)
+
+def _upload_transcript(text):
+    key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    file_ref = _file_refs.get(key)
+    if file_ref is None:
+        logger.info("Uploading transcript once via the File API...")
+        file_ref = genai.upload_file(
+            io.BytesIO(text.encode("utf-8")), mime_type="text/plain"
+        )
+        _file_refs.set(key, file_ref)
+    return file_ref
+
+# Prompt builders so the normal and streaming paths share the same prompts.
+# Long transcripts go as [prefix, file handle, suffix] parts so the text
+# bytes only cross the wire on the first call.
+def _summary_prompt(text, style="concise"):
+    prefix, suffix = SUMMARY_STYLES[style]
+    if len(text) > FILE_API_THRESHOLD:
+        return [prefix, _upload_transcript(text), suffix]
+    return "".join((prefix, text, suffix))
+
+def _notes_prompt(text):
+    if len(text) > FILE_API_THRESHOLD:
+        return [NOTES_PREFIX, _upload_transcript(text), NOTES_SUFFIX]
+    return "".join((NOTES_PREFIX, text, NOTES_SUFFIX))
+
+# Transcripts longer than this get split up and summarized in pieces first
+MAP_REDUCE_THRESHOLD = 16000
+
+# Precompiled so we don't rebuild the pattern on every call
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+def chunk_text(text, max_chars=16000):
+    """Splits text on sentence boundaries into pieces of about max_chars each."""
+    chunks = []
+    current = []
+    current_len = 0
+    for sentence in _SENTENCE_RE.split(text):
+        if current and current_len + len(sentence) > max_chars:
+            chunks.append(" ".join(current))
+            current = []
+            current_len = 0
+        current.append(sentence)
+        current_len += len(sentence) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def _summarize_chunk(chunk):
+    # The cheap fast model is plenty for the per-chunk "map" step
+    prompt = f"Summarize this part of a video transcript in 3-4 plain sentences. Keep only the key information:\n---\n{chunk}\n---"
+    return _FLASH_LITE_MODEL.generate_content(prompt).text.strip()
+
+def _map_summaries(text):
+    """Summarizes each chunk of a long transcript in parallel (map step).
+
+    The partial summaries then go through the normal summary prompt as the
+    reduce step, so the big model only ever sees a short input.
+    """
+    chunks = chunk_text(text)
+    logger.info("Long transcript: summarizing %d chunks in parallel...", len(chunks))
+    partials = [None] * len(chunks)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {executor.submit(_summarize_chunk, chunk): i for i, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            partials[futures[future]] = future.result()
+    return "\n".join(partials)
+
+def _stream_gemini(model, prompt):
+    """Yields response chunks as Gemini produces them instead of waiting for the whole answer."""
+    response = model.generate_content(prompt, stream=True)
+    for chunk in response:
+        if chunk.text:
+            yield chunk.text
+
+# Streaming versions for the Flask SSE endpoint
+def stream_summary(text, style="concise"):
+    yield from _stream_gemini(_FLASH_MODEL, _summary_prompt(text, style))
+
+def stream_notes(text):
+    yield from _stream_gemini(_FLASH_MODEL, _notes_prompt(text))
+
+# Failure sentinels as shared constants so callers compare against one
+# interned string instead of re-typing the literal
+SUMMARY_FAIL = "Sorry, couldn't make summary"
+NOTES_FAIL = "Sorry, couldn't make notes"
+
+# Placeholder replies for transcripts not worth an LLM call, also shared
+# so callers can tell them apart from a real summary
+SUMMARY_TOO_SHORT = "Transcript is too short to summarize"
+NOTES_TOO_SHORT = "Transcript is too short to make notes from"
+
+# Anything shorter than this isn't worth an LLM round-trip
+MIN_TRANSCRIPT_CHARS = 200
+
+def _too_thin(text):
+    """True when the transcript is too short or repetitive to be worth an LLM call.
+
+    Catches empty captions and videos whose "transcript" is the same noise
+    token (like a music marker) repeated over and over.
     """
+    if len(text) < MIN_TRANSCRIPT_CHARS:
+        return True
+    tokens = text.split()
+    if not tokens:
+        return True
+    _, most_common_count = Counter(tokens).most_common(1)[0]
+    return most_common_count / len(tokens) > 0.8
+
+# Echo streamed chunks to the terminal only when running as the CLI: the
+# Flask backend calls these from pool threads, where parallel jobs writing
+# to stdout at once just interleave garbage (it has /api/stream instead).
+# The __main__ block below turns this on.
+_echo_stream = False
+
+def _emit(part):
+    if _echo_stream:
+        sys.stdout.write(part)
+        sys.stdout.flush()
+
+# Functions for AI summary and notes
+@cache.cached("summary", extra="".join(p + s for p, s in SUMMARY_STYLES.values()),
+              max_age=30 * 86400, skip=(SUMMARY_FAIL,))
+def generate_summary(text, style="concise"):
+    """Generates a structured summary in the given style ("concise" or "detailed")."""
+    text = text.strip()
+    if _too_thin(text):
+        logger.info("Transcript too short or repetitive, skipping the LLM call")
+        return SUMMARY_TOO_SHORT
     try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        print("Making summary...")
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        logger.info("Making summary...")
+        # Long transcripts: summarize chunks in parallel, then reduce
+        if len(text) > MAP_REDUCE_THRESHOLD:
+            text = _map_summaries(text)
+        # Stream the chunks so a CLI user sees output right away
+        parts = []
+        for part in stream_summary(text, style):
+            _emit(part)
+            parts.append(part)
+        _emit("\n")
+        return "".join(parts).strip()
     except Exception as e:
-        print(f"Error making summary: {e}")
-        return "Sorry, couldn't make summary"
+        logger.error("Error making summary: %s", e)
+        return SUMMARY_FAIL
 
+@cache.cached("notes", extra=NOTES_PREFIX + NOTES_SUFFIX,
+              max_age=30 * 86400, skip=(NOTES_FAIL,))
 def generate_notes(text):
     """Generates concise, content-focused notes in a unique numbered format."""
-
-    # This prompt is specifically designed to filter out fluff and use a clean format.
-    """Generates concise, content-focused notes in a unique numbered format."""
-
-    # This prompt is specifically designed to filter out fluff and use a clean format.
-    # CORRECTED INDENTATION: This block is also now aligned correctly.
-    prompt = f"""
-You are an expert content distiller. Your task is to analyze the following transcript and produce a set of concise, high-impact notes in HINDI that focus exclusively on the core information.
-* you you to give output in only english language, even if u get input trascript of any language
-**Instructions:**
-
-**1. Content Focus & Filtering:**
-- **Distill the Core Message:** Extract the essential information—the "what" and the "why" of the video.
-- **Ignore Conversational Filler:** You MUST completely ignore and exclude all non-essential content (introductions, calls to action like "like and subscribe," etc.).
-- **Rephrase for Clarity:** Synthesize and rephrase the key points to make the notes unique and easy to understand.
-
-**2. Formatting Rules:**
-- **Use a Numbered List:** Structure the entire output as a clean, numbered list (1., 2., 3., etc.).
-- **No Headers or Bullets:** You MUST NOT use any Markdown headers (#) or bullet points (*, -).
-- **Use Bold for Emphasis:** Use **bold text** to highlight the most critical terms.
-
-Here is the transcript to process:
----
-{text}
----
-"""
-    
+    text = text.strip()
+    if _too_thin(text):
+        logger.info("Transcript too short or repetitive, skipping the LLM call")
+        return NOTES_TOO_SHORT
     try:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        print("Making notes...")
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        logger.info("Making notes...")
+        parts = []
+        for part in stream_notes(text):
+            _emit(part)
+            parts.append(part)
+        _emit("\n")
+        return "".join(parts).strip()
     except Exception as e:
-        print(f"Error making notes: {e}")
-        return "Sorry, couldn't make notes"
+        logger.error("Error making notes: %s", e)
+        return NOTES_FAIL
+
+
+# Caches so repeated menu choices reuse results instead of re-billing Gemini
+# (LRU-bounded so an import from a long-lived process can't bloat memory)
+summary_cache = cache.LRUCache(maxsize=256)
+notes_cache = cache.LRUCache(maxsize=256)
+
+def get_summary_cached(video_id, transcript):
+    summary = summary_cache.get(video_id)
+    if summary is None:
+        summary = generate_summary(transcript)
+        summary_cache.set(video_id, summary)
+    return summary
+
+def get_notes_cached(video_id, transcript):
+    notes = notes_cache.get(video_id)
+    if notes is None:
+        notes = generate_notes(transcript)
+        notes_cache.set(video_id, notes)
+    return notes
 
 
+def _synth_piece(piece):
+    # Each piece is one HTTP call to the TTS service, returned as MP3 bytes.
+    # Our pieces are already sentence-split and normalized, so gTTS's
+    # pre-processors would just re-scan the text for nothing.
+    buf = io.BytesIO()
+    gTTS(text=piece, lang='en', slow=False, pre_processor_funcs=[]).write_to_fp(buf)
+    return buf.getvalue()
+
 def text_to_audio(summary, filename="summary.mp3"):
     try:
-        print("Making audio file...")
-        tts = gTTS(text=summary, lang='en', slow=False)
-        tts.save(filename)
-        print(f"Audio saved: {filename}")
+        logger.info("Making audio file...")
+        # gTTS synthesizes serially, one network call per sentence chunk.
+        # Splitting the text ourselves and running the calls in parallel
+        # makes total time close to the slowest single piece.
+        pieces = chunk_text(summary, max_chars=500)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            audio_parts = list(executor.map(_synth_piece, pieces))
+        # MP3 frames can just be written back to back in order; the big
+        # buffer batches the parts into a few large write syscalls
+        with open(filename, 'wb', buffering=1 << 20) as f:
+            for part in audio_parts:
+                f.write(part)
+        logger.info("Audio saved: %s", filename)
         return filename
     except Exception as e:
-        print(f"Couldn't make audio: {e}")
+        logger.error("Couldn't make audio: %s", e)
         return None
 
 # Main program
 if __name__ == "__main__":
+    # Interactive run: show model output as it streams in
+    _echo_stream = True
+
     print("YouTube Video Summarizer")
     print("=" * 24)
-    
+
+    # Cache flags: --no-cache skips the cache, --clear-cache wipes it
+    if "--clear-cache" in sys.argv:
+        cache.cache.clear()
+        print("Cache cleared!")
+    if "--no-cache" in sys.argv:
+        cache.enabled = False
+        print("Cache is off for this run")
+
+
     yt_url = input("Enter YouTube URL: ").strip()
     
     video_id = get_video_id(yt_url)
@@ -153,37 +379,62 @@ if __name__ == "__main__":
                 print("What do you want to do?")
                 print("  1. Make a summary")
                 print("  2. Make notes")
-                print("  3. Exit")
+                print("  3. Make summary + notes + audio (all at once)")
+                print("  4. Exit")
                 print("="*30)
-                
-                choice = input("Pick 1-3: ").strip()
+
+                choice = input("Pick 1-4: ").strip()
 
                 if choice == '1':
                     print("\nMaking summary...")
-                    summary = generate_summary(transcript)
+                    summary = get_summary_cached(video_id, transcript)
                     print("\n" + "="*40)
                     print("SUMMARY")
                     print("="*40)
                     print(summary)
                     print("="*40)
-                    
+
                 elif choice == '2':
                     print("\nMaking notes...")
-                    notes = generate_notes(transcript)
+                    notes = get_notes_cached(video_id, transcript)
                     print("\n" + "="*40)
                     print("NOTES")
                     print("="*40)
                     print(notes)
                     print("="*40)
-                    
-                        
+
+
                 elif choice == '3':
+                    # Run the summary and notes requests at the same time since
+                    # they are independent network calls, then turn the summary
+                    # into audio once it is ready
+                    print("\nMaking summary, notes and audio together...")
+                    with ThreadPoolExecutor(max_workers=4) as executor:
+                        summary_future = executor.submit(get_summary_cached, video_id, transcript)
+                        notes_future = executor.submit(get_notes_cached, video_id, transcript)
+                        summary = summary_future.result()
+                        audio_future = executor.submit(text_to_audio, summary)
+                        notes = notes_future.result()
+                        audio_file = audio_future.result()
+                    print("\n" + "="*40)
+                    print("SUMMARY")
+                    print("="*40)
+                    print(summary)
+                    print("="*40)
+                    print("NOTES")
+                    print("="*40)
+                    print(notes)
+                    print("="*40)
+                    if audio_file:
+                        print(f"Audio saved as: {audio_file}")
+
+                elif choice == '4':
                     print("\nThanks for using the summarizer!")
                     print("Bye!")
                     break
-                    
+
                 else:
-                    print("Please pick 1, 2 or 3")
+                    print("Please pick 1, 2, 3 or 4")
         else:
             print("\nCouldn't get the transcript.")
             print("Maybe the video doesn't have captions or is private.")
\ No newline at end of file
@@ -0,0 +1,172 @@
+# Simple SQLite cache for transcripts and AI results
+# Keeps results between runs so we don't repeat expensive network/LLM calls
+
+import functools
+import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "summarizer_cache.db")
+
+class SQLiteCache:
+    """A small key/value cache stored in a SQLite file.
+
+    WAL mode lets readers and the writer work at the same time, which
+    matters once the Flask backend serves several requests at once.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, created_at INTEGER)"
+        )
+        self._conn.commit()
+
+    def get(self, key, max_age=None):
+        """Look up a key, treating entries older than max_age seconds as gone."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if max_age is not None and time.time() - created_at > max_age:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return value.decode("utf-8")
+
+    def set(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value.encode("utf-8"), int(time.time())),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+class LRUCache:
+    """Small bounded in-memory cache with optional TTL.
+
+    Keeps a long-running server's memory flat: once maxsize entries are in,
+    the least recently used one gets evicted. Used as the fast first tier in
+    front of SQLite and for the odd object (like File API handles) that
+    can't go to disk at all.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+# One shared cache for the whole program
+cache = SQLiteCache()
+
+# In-memory first tier in front of SQLite: bounded, so RSS stays flat no
+# matter how many unique videos a long-running server sees
+_mem = LRUCache(maxsize=2048, ttl=86400)
+
+# Turned off with the --no-cache flag
+enabled = True
+
+def make_key(kind, *parts):
+    """Build a short stable key from the kind plus whatever identifies the call."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(kind.encode("utf-8"))
+    for part in parts:
+        h.update(b"|")
+        h.update(str(part).encode("utf-8"))
+    return h.hexdigest()
+
+def cached(kind, extra="", max_age=None, skip=()):
+    """Decorator that caches a function's string result in SQLite.
+
+    The key mixes the kind, the arguments and an optional extra salt
+    (like a prompt template) so changing the prompt invalidates old entries.
+    max_age (seconds) makes entries expire, so stale data gets refetched.
+    Results that are None or listed in skip (like "sorry" failure
+    messages) are not cached, so failures get retried.
+    """
+    extra_hash = hashlib.sha1(extra.encode("utf-8")).hexdigest() if extra else ""
+
+    def decorator(func):
+        # Used to normalize arguments before keying: f(x) and f(x, "default")
+        # and f(x, style="default") are the same call and must share an entry
+        sig = inspect.signature(func)
+
+        # Coalesce concurrent calls for the same key: under bursty load the
+        # first caller does the work while the rest wait and then read the
+        # cache, instead of N identical network/LLM round-trips
+        in_flight = {}
+        flight_lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = make_key(kind, extra_hash, *bound.arguments.items())
+            hit = _mem.get(key)
+            if hit is not None:
+                return hit
+            hit = cache.get(key, max_age=max_age)
+            if hit is not None:
+                # Promote disk hits so the next lookup skips SQLite too
+                _mem.set(key, hit)
+                return hit
+            with flight_lock:
+                waiter = in_flight.get(key)
+                if waiter is None:
+                    in_flight[key] = threading.Event()
+            if waiter is not None:
+                waiter.wait()
+                hit = cache.get(key, max_age=max_age)
+                if hit is not None:
+                    return hit
+                # The leader failed (nothing was cached) - try ourselves
+                return func(*args, **kwargs)
+            try:
+                result = func(*args, **kwargs)
+                if result is not None and result not in skip:
+                    cache.set(key, result)
+                    _mem.set(key, result)
+                return result
+            finally:
+                with flight_lock:
+                    in_flight.pop(key).set()
+        return wrapper
+
+    return decorator
@@ -17,33 +17,222 @@ Send POST request to /api/process with:
   "operation": "summary" (or "notes", "transcript")
 }
 
+Concurrency model: every endpoint is I/O-bound (YouTube, Gemini, TTS), and
+all of that I/O releases the GIL, so the app scales by thread count rather
+than by an async event loop. waitress provides the request threads (tunable
+via WAITRESS_THREADS), long audio work runs on the shared background pool,
+and batch fan-out overlaps its network calls. An ASGI port (Quart/FastAPI)
+would raise the concurrency ceiling further but means swapping the whole
+Flask stack (waitress, flask-compress, flask-cors); not worth it at this
+scale.
 """
 
-from flask import Flask, request, jsonify
+from flask import (Flask, g, request, jsonify, Response, send_from_directory,
+                   stream_with_context)
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 from flask_cors import CORS
+import hashlib
+import json
+import logging
+import orjson
+import os
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
 
 # Import my functions
-from app import get_video_id, get_transcript, generate_summary, generate_notes
+import cache
+from app import (get_video_id, get_transcript, get_transcript_batch,
+                 generate_summary, generate_notes, stream_summary, stream_notes,
+                 text_to_audio, SUMMARY_FAIL, NOTES_FAIL, SUMMARY_TOO_SHORT)
+from prompts import SUMMARY_STYLES
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson - C-implemented, so serializing the big
+    transcript payloads is several times faster than the stdlib json module"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # orjson produces bytes; handing them straight to the response
+        # skips Werkzeug's str -> UTF-8 encode pass on big transcripts
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype="application/json"
+        )
 
 # Setup Flask
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)  # Allow frontend to connect
 
+# Transcript JSON compresses 5-10x, so gzip/brotli the text responses.
+# MP3 downloads are left alone - they're already compressed.
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_LEVEL'] = 6
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
+logger = logging.getLogger(__name__)
+
+# frozenset gives O(1) membership checks and is built once, not per request
+_VALID_OPS = frozenset(("transcript", "summary", "notes", "audio"))
+
+# Where generated audio files land
+AUDIO_DIR = Path("audio_files")
+AUDIO_DIR.mkdir(exist_ok=True)
+
+# One shared worker pool for everything slow: audio jobs, batch fan-out.
+# All the work is network I/O (Gemini, YouTube, TTS) which releases the
+# GIL, so a generous worker count just means more overlapped waits.
+EXEC = ThreadPoolExecutor(max_workers=16)
+
+# job_id -> (future, created_at); finished jobs are pruned after an hour
+# so a long-running server doesn't accumulate futures forever
+_audio_jobs = {}
+JOB_TTL = 3600
+
+def _prune_jobs():
+    cutoff = time.time() - JOB_TTL
+    for job_id, (job, created_at) in list(_audio_jobs.items()):
+        if job.done() and created_at < cutoff:
+            # pop, not del: two requests can race to prune the same job
+            _audio_jobs.pop(job_id, None)
+
+# Clients usually ask for the transcript and then click summary right after,
+# so we warm the summary/notes caches in the background while they read.
+# Turn off with PREFETCH_SUMMARY=0 if the wasted Gemini calls matter more.
+PREFETCH_SUMMARY = os.environ.get("PREFETCH_SUMMARY", "1") != "0"
+
+# At most 2 speculative jobs at once so a burst of transcript requests
+# can't flood the pool (or the Gemini bill) with guesses
+_prefetch_slots = threading.Semaphore(2)
+
+def _prefetch(transcript):
+    try:
+        generate_summary(transcript)
+        generate_notes(transcript)
+    finally:
+        _prefetch_slots.release()
+
+# Index of finished audio files so listing them never scans the directory -
+# a per-request glob plus stat per file is O(files) syscalls and only grows.
+# The lock keeps worker threads adding files from tripping up a request
+# that is iterating the index at the same time.
+_audio_index = {}
+_audio_index_lock = threading.Lock()
+
+def _index_audio_file(path):
+    stat = path.stat()
+    with _audio_index_lock:
+        _audio_index[path.name] = {"size_bytes": stat.st_size, "created_at": stat.st_ctime}
+
+# Populate once at startup; afterwards _make_audio keeps it current.
+# scandir hands back DirEntry objects whose stat() is cached from the
+# directory read, so this is one syscall per file instead of two.
+with os.scandir(AUDIO_DIR) as _entries:
+    for _entry in _entries:
+        if _entry.name.endswith(".mp3"):
+            _stat = _entry.stat()
+            _audio_index[_entry.name] = {"size_bytes": _stat.st_size, "created_at": _stat.st_ctime}
+
+def _make_audio(transcript, video_id):
+    """Background job: summary then TTS, returns the mp3 filename"""
+    summary = generate_summary(transcript)
+    if summary in (SUMMARY_FAIL, SUMMARY_TOO_SHORT):
+        # Don't read placeholder text out loud - fail the job so
+        # audio_status reports the error instead of a bogus mp3.
+        # This also keeps placeholders out of the content-addressed
+        # files below, where one would get replayed forever.
+        raise RuntimeError("No usable summary, no audio to make")
+    # Content-addressed filename: identical summaries share one file, so a
+    # repeat request skips the TTS step (usually the slowest one) entirely
+    key = hashlib.sha256(summary.encode("utf-8")).hexdigest()[:16]
+    canonical = AUDIO_DIR / f"{key}.mp3"
+    if not canonical.exists():
+        if not text_to_audio(summary, str(canonical)):
+            raise RuntimeError("Audio generation failed")
+        _index_audio_file(canonical)
+    # Keep the friendly per-video name as a symlink to the canonical file
+    alias = AUDIO_DIR / f"summary_{video_id}.mp3"
+    try:
+        alias.unlink(missing_ok=True)
+        alias.symlink_to(canonical.name)
+        _index_audio_file(alias)
+        return alias.name
+    except OSError:
+        # Filesystem without symlinks - the canonical name still works
+        return canonical.name
+
 # Helper functions
+
+# The timestamp is formatted once per request in before_request and reused
+# by every helper call, which also keeps multi-part responses consistent
+@app.before_request
+def _stamp_request():
+    g.ts = datetime.now().isoformat()
+
+# Whole-response cache: a repeat (url, operation, style) request serves the
+# stored JSON bytes straight from this hook - no validation chain, no
+# handler, no re-serialization
+_resp_cache = cache.LRUCache(maxsize=1024, ttl=3600)
+
+@app.before_request
+def _check_response_cache():
+    if request.path != '/api/process' or request.method != 'POST':
+        return None
+    # Parse once here; the handler reuses g.data instead of re-parsing
+    g.data = request.get_json(silent=True)
+    if not isinstance(g.data, dict):
+        return None
+    url = g.data.get('url')
+    operation = g.data.get('operation')
+    if isinstance(url, str) and isinstance(operation, str):
+        operation = operation.lower()
+        # Audio responses carry one-shot job IDs, so they can't be replayed
+        if operation != 'audio':
+            g.cache_key = (url, operation, g.data.get('style'))
+            body = _resp_cache.get(g.cache_key)
+            if body is not None:
+                return Response(body, mimetype='application/json')
+    return None
+
+def _store_response(response):
+    """Remember a finished /api/process response for replay on repeats"""
+    key = getattr(g, 'cache_key', None)
+    if key is not None:
+        _resp_cache.set(key, response.get_data())
+
+def _now_iso():
+    try:
+        return g.ts
+    except (RuntimeError, AttributeError):
+        # Outside a request context (background jobs, shell)
+        return datetime.now().isoformat()
+
 def make_success_response(data, message="Success"):
     """Make a simple success response"""
     return {
         "success": True,
         "message": message,
-        "data": data
+        "data": data,
+        "timestamp": _now_iso()
     }
 
 def make_error_response(message, status_code=400):
     """Make a simple error response"""
     return {
         "success": False,
-        "error": message
+        "error": message,
+        "timestamp": _now_iso()
     }, status_code
 
 def check_required_fields(data, required_fields):
@@ -53,18 +242,93 @@ def check_required_fields(data, required_fields):
             return False, f"Missing: {field}"
     return True, None
 
+# Transcripts bigger than this stream out in chunks instead of being
+# buffered into one giant JSON string (which doubles memory while encoding)
+STREAM_THRESHOLD = 64 * 1024
+
+def _stream_transcript(video_id, transcript, start_time):
+    """Yields the transcript response as JSON pieces of bounded size.
+
+    The envelope is serialized once with the data object left open, then the
+    transcript goes out in 64KB escaped slices, so peak memory per response
+    stays constant no matter how long the video is and the client starts
+    receiving bytes immediately.
+    """
+    meta = {
+        "success": True,
+        "message": "Got transcript!",
+        "timestamp": _now_iso(),
+        "data": {
+            "video_id": video_id,
+            "length": len(transcript),
+            "time_taken": round(time.time() - start_time, 2)
+        }
+    }
+    head = orjson.dumps(meta)
+    # Drop the closing }} and splice the transcript field into data
+    yield head[:-2] + b',"transcript":"'
+    for i in range(0, len(transcript), 65536):
+        piece = orjson.dumps(transcript[i:i + 65536])
+        # Strip the surrounding quotes, keep the escaped payload
+        yield piece[1:-1]
+    yield b'"}}'
+
+def process_batch(urls, operation):
+    """Process several videos at once - transcripts are fetched concurrently"""
+    video_ids = []
+    for url in urls:
+        video_id = get_video_id(url)
+        if not video_id:
+            return make_error_response(f"Invalid YouTube URL: {url}", 400)
+        video_ids.append(video_id)
+
+    start_time = time.time()
+
+    # One concurrent fan-out instead of fetching one video after another
+    transcripts = get_transcript_batch(video_ids)
+
+    # Fan the per-video LLM calls out on the shared pool too, so a batch of
+    # summaries takes about as long as the slowest single one
+    generate = generate_summary if operation == 'summary' else generate_notes
+    futures = {}
+    for video_id, transcript in zip(video_ids, transcripts):
+        if transcript and operation != 'transcript':
+            futures[video_id] = EXEC.submit(generate, transcript)
+
+    results = []
+    for video_id, transcript in zip(video_ids, transcripts):
+        if not transcript:
+            results.append({"video_id": video_id, "error": "Could not get transcript"})
+            continue
+
+        if operation == 'transcript':
+            results.append({"video_id": video_id, "transcript": transcript, "length": len(transcript)})
+        elif operation == 'summary':
+            results.append({"video_id": video_id, "summary": futures[video_id].result()})
+        elif operation == 'notes':
+            results.append({"video_id": video_id, "notes": futures[video_id].result()})
+
+    result = {
+        "results": results,
+        "count": len(results),
+        "time_taken": round(time.time() - start_time, 2)
+    }
+    return jsonify(make_success_response(result, "Processed batch!"))
+
 # Routes
 
+# Static payload built once instead of per request
+_API_INFO = {
+    "name": "YouTube Video Summarizer",
+    "description": "Simple API to summarize YouTube videos",
+    "how_to_use": "Send POST to /api/process with url and operation",
+    "operations": ["transcript", "summary", "notes", "audio"]
+}
+
 @app.route('/', methods=['GET'])
 def home():
     """Show what this API does"""
-    info = {
-        "name": "YouTube Video Summarizer",
-        "description": "Simple API to summarize YouTube videos",
-        "how_to_use": "Send POST to /api/process with url and operation",
-        "operations": ["transcript", "summary", "notes"]
-    }
-    return jsonify(make_success_response(info, "API is working!"))
+    return jsonify(make_success_response(_API_INFO, "API is working!"))
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -75,9 +339,9 @@ def health_check():
 def process_video():
     """Process YouTube videos - main function"""
     try:
-        # Get the data from request
-        data = request.get_json()
-        
+        # Already parsed once in the before_request cache hook
+        data = getattr(g, 'data', None)
+
         if not data:
             return make_error_response("No data provided", 400)
         
@@ -90,9 +354,15 @@ def process_video():
         operation = data['operation'].lower()
         
         # Check if operation is valid
-        if operation not in ['transcript', 'summary', 'notes']:
-            return make_error_response("Operation must be: transcript, summary, or notes", 400)
-        
+        if operation not in _VALID_OPS:
+            return make_error_response("Operation must be: transcript, summary, notes, or audio", 400)
+
+        # A list of URLs means batch mode - fetch all transcripts concurrently
+        if isinstance(url, list):
+            if operation == 'audio':
+                return make_error_response("Batch mode supports: transcript, summary, or notes", 400)
+            return process_batch(url, operation)
+
         # Get video ID from URL
         video_id = get_video_id(url)
         if not video_id:
@@ -107,17 +377,30 @@ def process_video():
         start_time = time.time()
         
         if operation == 'transcript':
+            # Speculatively warm the summary/notes caches for the follow-up click
+            if PREFETCH_SUMMARY and _prefetch_slots.acquire(blocking=False):
+                EXEC.submit(_prefetch, transcript)
+            if len(transcript) > STREAM_THRESHOLD:
+                return Response(
+                    stream_with_context(_stream_transcript(video_id, transcript, start_time)),
+                    mimetype='application/json'
+                )
             result = {
                 "video_id": video_id,
                 "transcript": transcript,
                 "length": len(transcript),
                 "time_taken": round(time.time() - start_time, 2)
             }
-            return jsonify(make_success_response(result, "Got transcript!"))
+            response = jsonify(make_success_response(result, "Got transcript!"))
+            _store_response(response)
+            return response
         
         elif operation == 'summary':
-            summary = generate_summary(transcript)
-            if summary == "Sorry, couldn't make summary":
+            style = data.get('style', 'concise')
+            if style not in SUMMARY_STYLES:
+                return make_error_response("Style must be: concise or detailed", 400)
+            summary = generate_summary(transcript, style)
+            if summary == SUMMARY_FAIL:
                 return make_error_response("Summary failed", 500)
             
             result = {
@@ -127,25 +410,145 @@ def process_video():
                 "summary_length": len(summary),
                 "time_taken": round(time.time() - start_time, 2)
             }
-            return jsonify(make_success_response(result, "Made summary!"))
+            response = jsonify(make_success_response(result, "Made summary!"))
+            _store_response(response)
+            return response
         
         elif operation == 'notes':
             notes = generate_notes(transcript)
-            if notes == "Sorry, couldn't make notes":
+            if notes == NOTES_FAIL:
                 return make_error_response("Notes failed", 500)
-            
+
             result = {
                 "video_id": video_id,
                 "notes": notes,
                 "time_taken": round(time.time() - start_time, 2)
             }
-            return jsonify(make_success_response(result, "Made notes!"))
+            response = jsonify(make_success_response(result, "Made notes!"))
+            _store_response(response)
+            return response
+
+        elif operation == 'audio':
+            # Kick the slow work off to the background and reply right away
+            _prune_jobs()
+            job_id = uuid.uuid4().hex
+            _audio_jobs[job_id] = (EXEC.submit(_make_audio, transcript, video_id), time.time())
+            result = {
+                "video_id": video_id,
+                "job_id": job_id,
+                "status_url": f"/api/audio/{job_id}"
+            }
+            return jsonify(make_success_response(result, "Audio job started!")), 202
     
     except Exception as e:
-        print(f"Error: {e}")
+        logger.error("Error: %s", e)
         return make_error_response(f"Something went wrong: {str(e)}", 500)
 
 
+@app.route('/api/stream', methods=['POST'])
+def stream_video():
+    """Stream a summary or notes as Server-Sent Events so clients see text as it arrives"""
+    data = request.get_json()
+
+    if not data:
+        return make_error_response("No data provided", 400)
+
+    is_valid, error_message = check_required_fields(data, ['url', 'operation'])
+    if not is_valid:
+        return make_error_response(error_message, 400)
+
+    operation = data['operation'].lower()
+    if operation not in ['summary', 'notes']:
+        return make_error_response("Operation must be: summary or notes", 400)
+
+    video_id = get_video_id(data['url'])
+    if not video_id:
+        return make_error_response("Invalid YouTube URL", 400)
+
+    transcript = get_transcript(video_id)
+    if not transcript:
+        return make_error_response("Could not get transcript - video might not have captions", 404)
+
+    chunks = stream_summary if operation == 'summary' else stream_notes
+
+    def generate():
+        try:
+            for chunk in chunks(transcript):
+                # json.dumps escapes the newlines so each SSE event stays one line
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps(f'Error: {e}')}\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
+
+@app.route('/api/audio/<job_id>', methods=['GET'])
+def audio_status(job_id):
+    """Check on a background audio job"""
+    entry = _audio_jobs.get(job_id)
+    if entry is None:
+        return make_error_response("Unknown job", 404)
+    job, _ = entry
+    if not job.done():
+        return jsonify(make_success_response({"status": "working"}, "Still making audio..."))
+    try:
+        filename = job.result()
+    except Exception as e:
+        return make_error_response(f"Audio job failed: {e}", 500)
+    result = {
+        "status": "done",
+        "filename": filename,
+        "download_url": f"/api/files/{filename}"
+    }
+    return jsonify(make_success_response(result, "Audio ready!"))
+
+@app.route('/api/files', methods=['GET'])
+def list_audio_files():
+    """List generated audio files straight from the in-memory index"""
+    # Copy under the lock so a TTS worker finishing mid-request can't
+    # change the dict while we iterate it
+    with _audio_index_lock:
+        entries = sorted(_audio_index.items())
+    files = [
+        {
+            "filename": name,
+            "size_bytes": info["size_bytes"],
+            "created_at": datetime.fromtimestamp(info["created_at"]).isoformat(),
+            "download_url": f"/api/files/{name}"
+        }
+        for name, info in entries
+    ]
+    return jsonify(make_success_response({"files": files, "count": len(files)}, "Audio files!"))
+
+# When nginx fronts the app, point AUDIO_ACCEL_PREFIX at an internal
+# location aliasing the audio directory and nginx serves the bytes itself
+AUDIO_ACCEL_PREFIX = os.environ.get("AUDIO_ACCEL_PREFIX")
+
+@app.route('/api/files/<filename>', methods=['GET'])
+def download_audio(filename):
+    """Download a finished audio file"""
+    if filename != Path(filename).name:
+        return make_error_response("Invalid filename", 400)
+    path = AUDIO_DIR / filename
+    if not path.is_file():
+        return make_error_response("File not found", 404)
+
+    if AUDIO_ACCEL_PREFIX:
+        # Hand the transfer to nginx via X-Accel-Redirect: the Python
+        # worker returns in microseconds instead of pumping MP3 bytes
+        response = Response(mimetype='audio/mpeg')
+        response.headers['X-Accel-Redirect'] = f"{AUDIO_ACCEL_PREFIX}/{filename}"
+        response.headers['Content-Disposition'] = f"attachment; filename={filename}"
+        return response
+
+    # conditional=True gives ETag/304 handling plus byte-range support,
+    # so interrupted downloads can resume instead of restarting
+    response = send_from_directory(AUDIO_DIR, filename, as_attachment=True, conditional=True)
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response
+
+
 
 # Error handlers
 @app.errorhandler(404)
@@ -161,8 +564,18 @@ if __name__ == '__main__':
     print("🚀 Starting YouTube Video Summarizer!")
     print("📝 What it does:")
     print("   - GET transcript from YouTube videos")
-    print("   - MAKE summaries and notes with AI") 
+    print("   - MAKE summaries and notes with AI")
     print("🌐 API running at: http://localhost:8000")
     print("📖 Test it: Go to http://localhost:8000 in your browser")
-    
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+
+    if os.environ.get("FLASK_DEBUG") == "1":
+        # Dev mode only - the Werkzeug server is single-threaded and its
+        # reloader/debugger add overhead to every request
+        app.run(host='0.0.0.0', port=8000, debug=True)
+    else:
+        # waitress gives a real thread pool, which matters when requests
+        # sit in multi-second LLM calls; raise WAITRESS_THREADS to push
+        # more concurrent I/O waits through one process
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=8000,
+              threads=int(os.environ.get("WAITRESS_THREADS", "16")))
\ No newline at end of file
@@ -0,0 +1,72 @@
+# Prompt templates for the summarizer
+# Kept in one module so the CLI and the Flask backend share a single
+# source of truth instead of drifting copies of the same text
+
+CONCISE_SUMMARY_PREFIX = """
+    You are an expert at creating highly concise and accurate summaries. Your task is to analyze the following video transcript and generate a summary that follows these strict rules:
+
+    **Content Rules:**
+    1.  **Be Extremely Concise:** The summary must be short and to the point. Extract only the most critical information.
+    2.  **Maintain Accuracy:** Ensure the summary is a faithful representation of the transcript's main ideas.
+
+    **Formatting Rules:**
+    1.  **Use a numbered list (1., 2., 3., etc.) for the main topics.**
+    2.  **Under each numbered point, you MAY use nested bullet points (* or -) for essential, brief details.**
+    3.  **Do NOT use any Markdown headers (e.g., #, ##, ###).** The output should be a clean list.
+    4.  ** make it under 150 words
+    Here is the transcript:
+    ---
+    """
+
+CONCISE_SUMMARY_SUFFIX = """
+    ---
+    """
+
+DETAILED_SUMMARY_PREFIX = """
+    You are an expert at creating thorough and accurate summaries. Your task is to analyze the following video transcript and generate a summary that follows these rules:
+
+    **Content Rules:**
+    1.  **Cover Every Main Topic:** Walk through the video in order and capture each major point with its supporting details.
+    2.  **Maintain Accuracy:** Ensure the summary is a faithful representation of the transcript's ideas.
+
+    **Formatting Rules:**
+    1.  **Use a numbered list (1., 2., 3., etc.) for the main topics.**
+    2.  **Under each numbered point, use nested bullet points (* or -) for the supporting details.**
+    3.  **Do NOT use any Markdown headers (e.g., #, ##, ###).** The output should be a clean list.
+    Here is the transcript:
+    ---
+    """
+
+DETAILED_SUMMARY_SUFFIX = """
+    ---
+    """
+
+# style name -> (prefix, suffix)
+SUMMARY_STYLES = {
+    "concise": (CONCISE_SUMMARY_PREFIX, CONCISE_SUMMARY_SUFFIX),
+    "detailed": (DETAILED_SUMMARY_PREFIX, DETAILED_SUMMARY_SUFFIX),
+}
+
+# The notes prompt is specifically designed to filter out fluff and use a clean format.
+NOTES_PREFIX = """
+You are an expert content distiller. Your task is to analyze the following transcript and produce a set of concise, high-impact notes in HINDI that focus exclusively on the core information.
+* you you to give output in only english language, even if u get input trascript of any language
+**Instructions:**
+
+**1. Content Focus & Filtering:**
+- **Distill the Core Message:** Extract the essential information—the "what" and the "why" of the video.
+- **Ignore Conversational Filler:** You MUST completely ignore and exclude all non-essential content (introductions, calls to action like "like and subscribe," etc.).
+- **Rephrase for Clarity:** Synthesize and rephrase the key points to make the notes unique and easy to understand.
+
+**2. Formatting Rules:**
+- **Use a Numbered List:** Structure the entire output as a clean, numbered list (1., 2., 3., etc.).
+- **No Headers or Bullets:** You MUST NOT use any Markdown headers (#) or bullet points (*, -).
+- **Use Bold for Emphasis:** Use **bold text** to highlight the most critical terms.
+
+Here is the transcript to process:
+---
+"""
+
+NOTES_SUFFIX = """
+---
+"""
@@ -0,0 +1,60 @@
+# Tests for the cache module (run with: python -m unittest test_cache)
+# Mostly guards the key building: callers spell the same call in several
+# ways (positional, keyword, defaults left out) and they must all share
+# one cache entry, or prefetched/batch results are never found again.
+
+import os
+import tempfile
+import unittest
+
+import cache
+
+
+class CachedKeyTest(unittest.TestCase):
+    def setUp(self):
+        # Fresh throwaway caches so tests don't touch the real db file
+        self._tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+        self._tmp.close()
+        self._old_cache = cache.cache
+        self._old_mem = cache._mem
+        cache.cache = cache.SQLiteCache(self._tmp.name)
+        cache._mem = cache.LRUCache(maxsize=64)
+
+    def tearDown(self):
+        cache.cache = self._old_cache
+        cache._mem = self._old_mem
+        os.unlink(self._tmp.name)
+
+    def test_default_args_share_one_entry(self):
+        calls = []
+
+        @cache.cached("test-summary")
+        def fake_summary(text, style="concise"):
+            calls.append((text, style))
+            return f"summary of {text} ({style})"
+
+        # One-arg, explicit-default positional and keyword are the same call
+        first = fake_summary("some transcript")
+        self.assertEqual(fake_summary("some transcript", "concise"), first)
+        self.assertEqual(fake_summary("some transcript", style="concise"), first)
+        self.assertEqual(len(calls), 1)
+
+        # A different style is a different call and gets its own entry
+        fake_summary("some transcript", "detailed")
+        self.assertEqual(len(calls), 2)
+
+    def test_skip_values_are_not_cached(self):
+        calls = []
+
+        @cache.cached("test-fail", skip=("sorry",))
+        def flaky(text):
+            calls.append(text)
+            return "sorry"
+
+        flaky("x")
+        flaky("x")
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()